@@ -6,18 +6,37 @@ Functions:
 - download_images(urls, out_dir): downloads images to folder.
 - parse_image_urls_from_html(html, base_url): helper to parse HTML (useful for tests).
 
-This is intentionally lightweight and uses requests + BeautifulSoup.
+This is intentionally lightweight and uses requests + BeautifulSoup (or selectolax when
+installed), with aiohttp for concurrent image downloads.
 """
 from __future__ import annotations
 
+import asyncio
 import os
-import time
-from typing import List, Optional
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
+from http.cookies import SimpleCookie
+from typing import List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+import aiohttp
+import img2pdf
 import requests
-from bs4 import BeautifulSoup
-from chapter_discovery import get_chapters_from_series, find_chapter_by_number
+from bs4 import BeautifulSoup, SoupStrainer
+from yarl import URL
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional fast parser
+    LexborHTMLParser = None
+try:
+    import lxml  # noqa: F401
+
+    _BS4_PARSER = "lxml"
+except ImportError:  # pragma: no cover - optional fast parser
+    _BS4_PARSER = "html.parser"
+from chapter_discovery import SESSION, Chapter, decode_body, find_chapter_by_number, get_chapters_from_series
 import db
 from datetime import datetime
 
@@ -28,21 +47,73 @@ DEFAULT_HEADERS = {
 VALID_EXTS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
 # keywords to ignore in candidate urls
 BLACKLIST_KEYWORDS = ("sprite", "logo", "favicon", "ads")
+# image formats img2pdf embeds into a PDF as-is, without decoding
+PDF_NATIVE_EXTS = (".jpg", ".jpeg", ".png")
+# upper bound on distinct URLs taken from the regex fallback; far above any chapter's page count
+FALLBACK_MAX_CANDIDATES = 2000
+# process-wide cap on image requests in flight. Every download_images call (one
+# per chapter worker, each with its own event loop) draws from the same slots.
+MAX_IMAGE_FETCHES = 8
+_FETCH_SLOTS = threading.BoundedSemaphore(MAX_IMAGE_FETCHES)
+# bounds concurrent disk writes independently of the number of in-flight downloads;
+# one pool shared by every download_images call, created on first use
+IO_WORKERS = 4
+_IO_POOL: Optional[ThreadPoolExecutor] = None
+_IO_POOL_LOCK = threading.Lock()
+# <img> attributes that may hold the page image, in order of preference
+_IMG_ATTRS = ("data-src", "data-lazy-src", "data-original", "data-srcset", "srcset", "src", "data-src-zoom", "data-image")
+# only <img>/<source> are inspected, so BeautifulSoup need not build the rest of the tree
+_STRAINER = SoupStrainer(["img", "source"])
+# inert <template> blocks, whose images are never rendered
+_TEMPLATE_RE = re.compile(r"<template\b.*?</template\s*>", re.IGNORECASE | re.DOTALL)
+# absolute image URLs inside scripts/JSON; stops at quotes, spaces or angle brackets
+_FALLBACK_IMG_RE = re.compile(r'https?://[^\s"\'""<>()]+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^\s"\'""<>)]*)?', re.IGNORECASE)
+# basenames that look like page images (e.g. 87981023_1920_2735_569558.webp)
+_PAGE_RE = re.compile(r"\d{7,9}_\d+_\d+_\d+\.(?:jpg|jpeg|png|webp)", re.IGNORECASE)
+
+
+def _io_pool() -> ThreadPoolExecutor:
+    """Return the shared file-write pool, creating it on first use."""
+    global _IO_POOL
+    with _IO_POOL_LOCK:
+        if _IO_POOL is None:
+            _IO_POOL = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="bato-io")
+        return _IO_POOL
 
 
 def _is_valid_image_url(u: str) -> bool:
     if not u:
         return False
     lower = u.lower()
-    if any(k in lower for k in BLACKLIST_KEYWORDS):
-        return False
-    for ext in VALID_EXTS:
-        if lower.split("?")[0].endswith(ext):
-            return True
+    path_only = lower.partition("?")[0]
     # allow images served without extension (rare) if path contains /cdn/ or /data/
-    if "/cdn/" in lower or "/data/" in lower:
-        return True
-    return False
+    if not (path_only.endswith(VALID_EXTS) or "/cdn/" in lower or "/data/" in lower):
+        return False
+    return not any(k in lower for k in BLACKLIST_KEYWORDS)
+
+
+def _iter_tag_attrs(html: str):
+    """Yield (tag_name, attrs) for every <img> and <source> tag in document order.
+
+    Uses selectolax's C-based lexbor parser when available and falls back to
+    BeautifulSoup (lxml if installed) otherwise. Tags inside <template> are skipped
+    on both paths. attrs is a plain dict; valueless attributes map to None.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for node in tree.css("img"):
+            yield "img", node.attributes
+        for node in tree.css("source"):
+            yield "source", node.attributes
+        return
+
+    # lexbor (like browsers) keeps <template> content out of the document tree;
+    # drop it here too so both paths return the same images
+    soup = BeautifulSoup(_TEMPLATE_RE.sub("", html), _BS4_PARSER, parse_only=_STRAINER)
+    for img in soup.find_all("img"):
+        yield "img", img.attrs
+    for src in soup.find_all("source"):
+        yield "source", src.attrs
 
 
 def parse_image_urls_from_html(html: str, base_url: Optional[str] = None) -> List[str]:
@@ -51,15 +122,29 @@ def parse_image_urls_from_html(html: str, base_url: Optional[str] = None) -> Lis
     Looks for common attributes: data-src, data-lazy-src, src, data-original and srcset.
     Normalizes relative URLs against base_url if provided.
     """
-    soup = BeautifulSoup(html, "html.parser")
     seen = set()
     out: List[str] = []
 
-    for img in soup.find_all("img"):
+    for tag, attrs in _iter_tag_attrs(html):
+        if tag == "source":
+            # <source> tags are sometimes used inside <picture>
+            val = attrs.get("srcset") or attrs.get("src")
+            if not val:
+                continue
+            # pick first url from srcset
+            if "," in val:
+                val = val.split(",")[0].split()[0]
+            if base_url:
+                val = urljoin(base_url, val)
+            val = val.strip()
+            if val not in seen and _is_valid_image_url(val):
+                seen.add(val)
+                out.append(val)
+            continue
+
         url_candidates = []
-        # common attributes
-        for attr in ("data-src", "data-lazy-src", "data-original", "data-srcset", "data-srcset", "srcset", "src"):
-            val = img.get(attr)
+        for attr in _IMG_ATTRS:
+            val = attrs.get(attr)
             if not val:
                 continue
             # if srcset-like, take first url
@@ -72,12 +157,6 @@ def parse_image_urls_from_html(html: str, base_url: Optional[str] = None) -> Lis
             else:
                 url_candidates.append(val)
 
-        # also check attributes that sometimes hold the image
-        for attr in ("data-src-zoom", "data-image"):
-            v = img.get(attr)
-            if v:
-                url_candidates.append(v)
-
         for raw in url_candidates:
             if not raw:
                 continue
@@ -91,21 +170,6 @@ def parse_image_urls_from_html(html: str, base_url: Optional[str] = None) -> Lis
                 seen.add(raw)
                 out.append(raw)
 
-    # also consider <source> tags (sometimes used inside <picture>)
-    for src in soup.find_all("source"):
-        val = src.get("srcset") or src.get("src")
-        if not val:
-            continue
-        # pick first url from srcset
-        if "," in val:
-            val = val.split(",")[0].split()[0]
-        if base_url:
-            val = urljoin(base_url, val)
-        val = val.strip()
-        if val not in seen and _is_valid_image_url(val):
-            seen.add(val)
-            out.append(val)
-
     return out
 
 
@@ -115,7 +179,7 @@ def get_image_urls(chapter_url: str, session: Optional[requests.Session] = None,
     chapter_url: full URL to the chapter page (e.g., a Bato.to chapter)
     session: optional requests.Session
     """
-    s = session or requests.Session()
+    s = session or SESSION
     try:
         r = s.get(chapter_url, headers=DEFAULT_HEADERS, timeout=timeout)
         r.raise_for_status()
@@ -123,7 +187,9 @@ def get_image_urls(chapter_url: str, session: Optional[requests.Session] = None,
         raise RuntimeError(f"Failed to fetch {chapter_url}: {e}")
 
     base = r.url  # after redirects
-    urls = parse_image_urls_from_html(r.text, base)
+    # decode once; both the HTML parser and the regex fallback reuse this string
+    html_text = decode_body(r)
+    urls = parse_image_urls_from_html(html_text, base)
 
     # Fallback: sometimes pages place images in <div class="page-break"> <img ...>
     # parse_image_urls_from_html already handles all img tags; we simply return.
@@ -132,50 +198,43 @@ def get_image_urls(chapter_url: str, session: Optional[requests.Session] = None,
     # for absolute image URLs inside scripts or JSON blobs. Use a regex that stops at
     # quotes, spaces or angle brackets to avoid capturing trailing punctuation.
     if not urls or len(urls) < 5:
-        import re
-
-        pattern = re.compile(r'https?://[^\s"\'""<>()]+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^\s"\'""<>)]*)?', flags=re.IGNORECASE)
-        matches = pattern.findall(r.text)
-
-        # Clean and deduplicate matches, prefer media-hosted images (contain '/media/')
+        # Clean and deduplicate matches, prefer media-hosted images (contain '/media/').
+        # Matches are consumed lazily and scanning stops once enough candidates exist.
         cleaned = []
-        for m in matches:
-            m = m.strip().rstrip(',;\")\']')
+        cleaned_set = set()
+        for match in _FALLBACK_IMG_RE.finditer(html_text):
+            m = match.group(0).strip().rstrip(',;\")\']')
             if base:
                 m = urljoin(base, m)
-            if m in cleaned:
+            if m in cleaned_set:
                 continue
+            cleaned_set.add(m)
             cleaned.append(m)
+            if len(cleaned) >= FALLBACK_MAX_CANDIDATES:
+                break
 
         # Prefer URLs that look like page images (contain '/media/') and valid extensions
+        urls_set = set(urls)
         for m in cleaned:
-            if m not in urls and _is_valid_image_url(m):
+            if m not in urls_set and _is_valid_image_url(m):
                 # optional heuristic: prefer /media/ paths for manga pages
                 if '/media/' in m or len(urls) < 1:
+                    urls_set.add(m)
                     urls.append(m)
 
     return urls
 
 
-def download_images(urls: List[str], out_dir: str, prefix: Optional[str] = None, session: Optional[requests.Session] = None, limit: Optional[int] = None, delay: float = 0.2) -> List[str]:
-    """Download images to out_dir and return list of saved file paths.
+def _plan_output_paths(urls: List[str], out_dir: str, prefix: Optional[str] = None, start: int = 0) -> List[str]:
+    """Return one output path per url, in order.
 
-    Keeps original filename if possible; otherwise uses numeric prefix.
+    Keeps original filename if possible; otherwise uses numeric prefix (numbered
+    from `start`). Names are resolved up front so concurrent downloads never race
+    for the same file.
     """
-    os.makedirs(out_dir, exist_ok=True)
-    s = session or requests.Session()
-    saved = []
-    count = 0
-    for i, url in enumerate(urls):
-        if limit is not None and count >= limit:
-            break
-        try:
-            r = s.get(url, headers=DEFAULT_HEADERS, stream=True, timeout=20)
-            r.raise_for_status()
-        except Exception as e:
-            print(f"Failed to download {url}: {e}")
-            continue
-
+    taken = set()
+    out = []
+    for i, url in enumerate(urls, start):
         path = urlparse(url).path
         fname = os.path.basename(path)
         if not fname:
@@ -185,20 +244,139 @@ def download_images(urls: List[str], out_dir: str, prefix: Optional[str] = None,
         out_path = os.path.join(out_dir, fname)
 
         # avoid overwriting: if exists, add numeric suffix
-        if os.path.exists(out_path):
+        if os.path.exists(out_path) or out_path in taken:
             base, ext = os.path.splitext(out_path)
             k = 1
-            while os.path.exists(f"{base}_{k}{ext}"):
+            while os.path.exists(f"{base}_{k}{ext}") or f"{base}_{k}{ext}" in taken:
                 k += 1
             out_path = f"{base}_{k}{ext}"
+        taken.add(out_path)
+        out.append(out_path)
+    return out
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to path via a temporary file so readers never see a partial image."""
+    tmp = f"{path}.part"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        # don't leave a stray .part file that later makes the folder look downloaded
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@asynccontextmanager
+async def _fetch_slot():
+    """Hold one of the process-wide _FETCH_SLOTS without blocking the event loop."""
+    while not _FETCH_SLOTS.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        yield
+    finally:
+        _FETCH_SLOTS.release()
+
+
+async def _fetch_one(client: aiohttp.ClientSession, sem: asyncio.Semaphore, io_pool: ThreadPoolExecutor, url: str, out_path: str, backoff: float, retries: int) -> Optional[str]:
+    """Download a single url to out_path, retrying with backoff on HTTP 429.
+
+    The file write runs on io_pool after the semaphore is released, so disk writes
+    overlap with other downloads instead of blocking the event loop.
+    """
+    data = None
+    async with sem, _fetch_slot():
+        for attempt in range(retries + 1):
+            try:
+                async with client.get(url) as resp:
+                    if resp.status == 429 and attempt < retries:
+                        retry_after = resp.headers.get("Retry-After", "")
+                        wait = float(retry_after) if retry_after.isdigit() else backoff * (2 ** attempt)
+                        await asyncio.sleep(wait)
+                        continue
+                    resp.raise_for_status()
+                    # read() buffers the body inside aiohttp instead of a
+                    # Python-level loop over 32KB chunks
+                    data = await resp.read()
+                break
+            except Exception as e:
+                print(f"Failed to download {url}: {e}")
+                return None
+    if data is None:
+        return None
+
+    try:
+        await asyncio.get_running_loop().run_in_executor(io_pool, _atomic_write, out_path, data)
+    except OSError as e:
+        print(f"Failed to save {url} to {out_path}: {e}")
+        return None
+    return out_path
+
+
+def _load_cookies(jar: aiohttp.CookieJar, cookies: List[Tuple[str, str, str, str]]) -> None:
+    """Add (name, value, domain, path) cookies to jar, each scoped to its own domain.
+
+    Cookies without a domain are dropped rather than sent to every image host.
+    """
+    for name, value, domain, path in cookies:
+        if not domain:
+            continue
+        morsel = SimpleCookie()
+        morsel[name] = value
+        morsel[name]["domain"] = domain
+        morsel[name]["path"] = path or "/"
+        jar.update_cookies(morsel, response_url=URL(f"https://{domain.lstrip('.')}/"))
+
 
-        with open(out_path, "wb") as fh:
-            for chunk in r.iter_content(1024 * 32):
-                fh.write(chunk)
-        saved.append(out_path)
-        count += 1
-        time.sleep(delay)
+async def _download_images_async(urls: List[str], out_paths: List[str], cookies: Optional[List[Tuple[str, str, str, str]]] = None, concurrency: int = 8, backoff: float = 0.2, retries: int = 3) -> List[str]:
+    """Download urls concurrently to the matching out_paths.
 
+    Concurrency is capped by a semaphore and the connector's per-host limit, and
+    across threads by MAX_IMAGE_FETCHES; file writes go through the shared
+    IO_WORKERS-thread pool from _io_pool().
+    Proxy settings are taken from the environment (HTTPS_PROXY, NO_PROXY, ...) as
+    requests does. Returns saved paths in the same order as urls, skipping failures.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=20, sock_read=20)
+    io_pool = _io_pool()
+    async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, timeout=timeout, trust_env=True) as client:
+        if cookies:
+            _load_cookies(client.cookie_jar, cookies)
+        tasks = [_fetch_one(client, sem, io_pool, u, p, backoff, retries) for u, p in zip(urls, out_paths)]
+        results = await asyncio.gather(*tasks)
+    return [p for p in results if p]
+
+
+def download_images(urls: List[str], out_dir: str, prefix: Optional[str] = None, session: Optional[requests.Session] = None, limit: Optional[int] = None, delay: float = 0.2, concurrency: int = 8) -> List[str]:
+    """Download images to out_dir and return list of saved file paths.
+
+    Keeps original filename if possible; otherwise uses numeric prefix.
+    `limit` caps the number of saved images; urls that fail do not count towards it.
+    Images are fetched concurrently (up to `concurrency` at a time); `delay` is the
+    base backoff in seconds used when the server answers HTTP 429. Cookies from
+    `session` are forwarded if given, only to hosts matching each cookie's domain.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    cookies = [(c.name, c.value, c.domain, c.path) for c in session.cookies] if session is not None else None
+    if limit is None:
+        out_paths = _plan_output_paths(urls, out_dir, prefix)
+        return asyncio.run(_download_images_async(urls, out_paths, cookies=cookies, concurrency=concurrency, backoff=delay))
+
+    # limit counts saved images: when some fail, move on to the next urls in
+    # further batches until `limit` are saved or the list runs out
+    saved: List[str] = []
+    pos = 0
+    while len(saved) < limit and pos < len(urls):
+        batch = urls[pos:pos + limit - len(saved)]
+        out_paths = _plan_output_paths(batch, out_dir, prefix, start=pos)
+        saved += asyncio.run(_download_images_async(batch, out_paths, cookies=cookies, concurrency=concurrency, backoff=delay))
+        pos += len(batch)
     return saved
 
 
@@ -220,43 +398,75 @@ def select_one_per_page(urls: List[str]) -> List[str]:
     - Extract the first long integer from the basename (e.g., 87981023) and sort by it.
     - If no integer is found, preserve original order of first occurrence.
     """
-    from collections import OrderedDict
-    import re
-
-    seen = OrderedDict()
-    for u in urls:
-        b = _basename_key(u)
-        if not b:
-            continue
-        if b not in seen:
-            seen[b] = u
-
     # Preserve the original order of first occurrence (which usually matches
     # the order in the page's JSON/script). This avoids reordering pages when
     # the numeric ids are not strictly sequential.
-    # Also filter out obvious site assets like '/static-assets/'.
-    out = []
-    # Prefer basenames that look like page images (e.g. 87981023_1920_2735_569558.webp)
-    page_re = re.compile(r"\d{7,9}_\d+_\d+_\d+\.(?:jpg|jpeg|png|webp)", re.IGNORECASE)
+    # Also filter out obvious site assets like '/static-assets/' and prefer
+    # basenames that look like page images (see _PAGE_RE).
+    seen = set()
     pages = []
     others = []
-    for b, u in seen.items():
+    for u in urls:
+        b = _basename_key(u)
+        if not b or b in seen:
+            continue
+        seen.add(b)
         if '/static-assets/' in u:
             continue
-        if page_re.search(b):
-            pages.append(u)
-        else:
-            others.append(u)
+        (pages if _PAGE_RE.search(b) else others).append(u)
 
     # Return pages first (in original order), then any others.
     return pages + others
 
 
+def _to_jpeg_for_pdf(src: str, dst: str) -> Optional[str]:
+    """Re-encode src as an RGB JPEG at dst for PDF embedding. Returns dst, or None
+    if src cannot be opened as an image.
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(src) as img:
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img.save(dst, "JPEG", quality=95)
+        return dst
+    except Exception as e:
+        print(f"Warning: failed to open {src} as image: {e}")
+        return None
+
+
+def _prepare_pdf_inputs(saved: List[str], work_dir: str, validate: bool = False) -> List[str]:
+    """Return image paths ready for img2pdf, in page order.
+
+    JPEG/PNG files are embedded directly with img2pdf and pass through untouched.
+    Everything else (webp, gif, ...) is converted to JPEG in work_dir. With
+    validate set, each JPEG/PNG is first checked on its own with img2pdf and only
+    the ones it rejects are converted. Pillow releases the GIL while decoding, so
+    the work runs on a thread pool. Unreadable images are dropped.
+    """
+    def _one(item):
+        i, p = item
+        if p.lower().endswith(PDF_NATIVE_EXTS):
+            if not validate:
+                return p
+            try:
+                img2pdf.convert([p])
+                return p
+            except Exception as e:
+                print(f"Warning: {p} cannot be embedded directly ({e}); re-encoding it")
+        return _to_jpeg_for_pdf(p, os.path.join(work_dir, f"pdf_{i:04d}.jpg"))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+        # map (not as_completed) keeps page order
+        return [p for p in ex.map(_one, enumerate(saved)) if p]
+
+
 def download_and_make_pdf(chapter_url: str, out_pdf_path: str, session: Optional[requests.Session] = None, limit: Optional[int] = None) -> str:
     """Fetch image URLs for chapter_url, select one mirror per page, download them and
     combine into a single PDF saved at out_pdf_path. Returns path to the saved PDF.
     """
-    s = session or requests.Session()
+    s = session or SESSION
     urls = get_image_urls(chapter_url, session=s)
     if not urls:
         raise RuntimeError("No image URLs found")
@@ -273,53 +483,76 @@ def download_and_make_pdf(chapter_url: str, out_pdf_path: str, session: Optional
         if not saved:
             raise RuntimeError("Failed to download images for PDF generation")
 
-        # Convert images to PDF using Pillow
-        from PIL import Image
-
-        pil_images = []
-        for p in saved:
-            try:
-                img = Image.open(p)
-                # Convert to RGB
-                if img.mode in ("RGBA", "LA") or (hasattr(img, "mode") and img.mode != "RGB"):
-                    img = img.convert("RGB")
-                pil_images.append(img)
-            except Exception as e:
-                print(f"Warning: failed to open {p} as image: {e}")
-
-        if not pil_images:
+        inputs = _prepare_pdf_inputs(saved, td)
+        if not inputs:
             raise RuntimeError("No images could be opened for PDF creation")
 
+        layout = img2pdf.get_fixed_dpi_layout_fun((100, 100))
+        try:
+            pdf_bytes = img2pdf.convert(inputs, layout_fun=layout)
+        except Exception as e:
+            # e.g. a PNG img2pdf can't handle or a file whose extension lies:
+            # find the offending pages and re-encode only those through Pillow
+            print(f"Warning: direct PDF embedding failed ({e}); checking pages individually")
+            inputs = _prepare_pdf_inputs(saved, td, validate=True)
+            if not inputs:
+                raise RuntimeError("No images could be opened for PDF creation")
+            pdf_bytes = img2pdf.convert(inputs, layout_fun=layout)
+
         # Ensure output dir exists
         os.makedirs(os.path.dirname(out_pdf_path), exist_ok=True)
 
-        first, rest = pil_images[0], pil_images[1:]
-        first.save(out_pdf_path, "PDF", resolution=100.0, save_all=True, append_images=rest)
+        with open(out_pdf_path, "wb") as fh:
+            fh.write(pdf_bytes)
 
         return out_pdf_path
 
 
-def get_latest_chapter(series_id: str, session: Optional[requests.Session] = None):
-    """Return the Chapter object for the latest chapter in the series."""
-    chapters = get_chapters_from_series(series_id, session)
+def get_latest_chapter(series_id: str, session: Optional[requests.Session] = None, chapters: Optional[List[Chapter]] = None):
+    """Return the Chapter object for the latest chapter in the series.
+
+    Pass `chapters` (from get_chapters_from_series) to avoid re-fetching the series page.
+    """
+    if chapters is None:
+        chapters = get_chapters_from_series(series_id, session)
     if not chapters:
         raise RuntimeError(f"No chapters found for series {series_id}")
     # chapters are sorted by number ascending
     return chapters[-1]
 
 
-def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str, make_pdf: bool = True, session: Optional[requests.Session] = None, dry_run: bool = False):
+def _artifact_path(out_dir: str, series_id: str, chapter_num: float, make_pdf: bool) -> str:
+    """Return the PDF path (make_pdf) or images folder for a chapter under out_dir."""
+    safe_series = series_id.replace('/', '_')
+    base = os.path.join(out_dir, f"{safe_series}_ch_{str(float(chapter_num)).replace('.', '_')}")
+    return f"{base}.pdf" if make_pdf else base
+
+
+def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str, make_pdf: bool = True, session: Optional[requests.Session] = None, dry_run: bool = False, chapters: Optional[List[Chapter]] = None):
     """Download a specific chapter by number. Returns path to saved artifact.
 
     If make_pdf is True, creates a PDF under out_dir. Otherwise saves images into a subfolder.
+    Pass `chapters` (from get_chapters_from_series) to avoid re-fetching the series page.
+    Chapters the DB records as completed are skipped before any network work, as
+    long as the recorded artifact is the one requested and still exists.
     """
-    chap = find_chapter_by_number(series_id, chapter_num, session)
+    if not dry_run:
+        try:
+            recorded = db.get_downloaded_path(series_id, chapter_num)
+        except Exception:
+            # DB not initialized (e.g. library use); fall back to the filesystem checks below
+            recorded = None
+        expected = _artifact_path(out_dir, series_id, chapter_num, make_pdf)
+        if recorded and os.path.normpath(recorded) == os.path.normpath(expected) and os.path.exists(recorded):
+            print(f"Skipping download; chapter {chapter_num} already recorded: {recorded}")
+            return recorded
+
+    chap = find_chapter_by_number(series_id, chapter_num, session, chapters=chapters)
     if not chap:
         raise RuntimeError(f"Chapter {chapter_num} not found for series {series_id}")
     url = chap.get_url(series_id)
-    safe_series = series_id.replace('/', '_')
     if make_pdf:
-        out_pdf = os.path.join(out_dir, f"{safe_series}_ch_{str(chap.chapter_num).replace('.', '_')}.pdf")
+        out_pdf = _artifact_path(out_dir, series_id, chap.chapter_num, make_pdf=True)
         if dry_run:
             print(f"[dry-run] Would create PDF: {out_pdf} from {url}")
             # Record dry-run intent
@@ -328,22 +561,14 @@ def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str,
             except Exception:
                 pass
             return out_pdf
-        # Skip if already exists
+        # Skip if already exists; the DB pre-check above missed it, so record it as completed
         if os.path.exists(out_pdf) and os.path.getsize(out_pdf) > 1024:
-            # ensure DB has a record; if so, skip. Otherwise record and skip
             try:
-                if db.was_downloaded(series_id, chap.chapter_num):
-                    print(f"Skipping download; PDF already exists: {out_pdf}")
-                    return out_pdf
-                else:
-                    # record existing file as completed
-                    size = os.path.getsize(out_pdf)
-                    db.record_download(series_id, chap.chapter_num, chap.chapter_id, url, out_pdf, status="completed", size=size)
-                    print(f"Skipping download; PDF already exists (recorded): {out_pdf}")
-                    return out_pdf
+                db.record_download(series_id, chap.chapter_num, chap.chapter_id, url, out_pdf, status="completed", size=os.path.getsize(out_pdf))
             except Exception:
-                print(f"Skipping download; PDF already exists: {out_pdf}")
-                return out_pdf
+                pass
+            print(f"Skipping download; PDF already exists: {out_pdf}")
+            return out_pdf
         print(f"Downloading chapter {chap.display_name} -> {out_pdf}")
         res = download_and_make_pdf(url, out_pdf, session=session)
         try:
@@ -354,7 +579,7 @@ def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str,
         return res
     else:
         # download images into folder
-        out_folder = os.path.join(out_dir, f"{safe_series}_ch_{str(chap.chapter_num).replace('.', '_')}")
+        out_folder = _artifact_path(out_dir, series_id, chap.chapter_num, make_pdf=False)
         if dry_run:
             print(f"[dry-run] Would download images to: {out_folder} from {url}")
             try:
@@ -362,20 +587,14 @@ def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str,
             except Exception:
                 pass
             return out_folder
-        # Skip if folder exists and has files
+        # Skip if folder exists and has files; record it as completed (size unknown)
         if os.path.isdir(out_folder) and any(os.scandir(out_folder)):
             try:
-                if db.was_downloaded(series_id, chap.chapter_num):
-                    print(f"Skipping download; images folder already exists: {out_folder}")
-                    return out_folder
-                else:
-                    # record existing folder as completed (size unknown)
-                    db.record_download(series_id, chap.chapter_num, chap.chapter_id, url, out_folder, status="completed", size=None)
-                    print(f"Skipping download; images folder already exists (recorded): {out_folder}")
-                    return out_folder
+                db.record_download(series_id, chap.chapter_num, chap.chapter_id, url, out_folder, status="completed", size=None)
             except Exception:
-                print(f"Skipping download; images folder already exists: {out_folder}")
-                return out_folder
+                pass
+            print(f"Skipping download; images folder already exists: {out_folder}")
+            return out_folder
         print(f"Downloading images for {chap.display_name} -> {out_folder}")
         urls = get_image_urls(url, session=session)
         saved = download_images(urls, out_folder, prefix="page", session=session)
@@ -393,14 +612,16 @@ def download_chapter_by_number(series_id: str, chapter_num: float, out_dir: str,
         return out_folder
 
 
-def download_from_chapter_to_latest(series_id: str, from_chapter: float, out_dir: str, make_pdf: bool = True, session: Optional[requests.Session] = None, dry_run: bool = False):
+def download_from_chapter_to_latest(series_id: str, from_chapter: float, out_dir: str, make_pdf: bool = True, session: Optional[requests.Session] = None, dry_run: bool = False, workers: int = 4):
     """Download all chapters from `from_chapter` up to the latest available.
 
     This implementation iterates in 0.5 increments from `from_chapter` to the latest
     and tries to resolve each chapter individually via find_chapter_by_number.
     If a particular chapter cannot be resolved it will be skipped with a message.
+    Up to `workers` chapters are downloaded concurrently; results keep chapter order.
+    Their image requests share the process-wide MAX_IMAGE_FETCHES limit.
     """
-    s = session or requests.Session()
+    s = session or SESSION
     chapters = get_chapters_from_series(series_id, s)
     if not chapters:
         raise RuntimeError(f"No chapters found for series {series_id}")
@@ -411,23 +632,30 @@ def download_from_chapter_to_latest(series_id: str, from_chapter: float, out_dir
     start_half = int(round(from_chapter * 2))
     end_half = int(round(latest * 2))
 
-    results = []
-    for i in range(start_half, end_half + 1):
-        chap_num = i / 2.0
+    def _job(chap_num: float):
         try:
             # Try to resolve this chapter (may raise if not found)
-            chap = find_chapter_by_number(series_id, chap_num, s)
+            chap = find_chapter_by_number(series_id, chap_num, s, chapters=chapters)
         except Exception as e:
             # Chapter not found — log and continue
             print(f"Chapter {chap_num} not found: {e}")
-            continue
+            return None
 
         try:
-            res = download_chapter_by_number(series_id, chap.chapter_num, out_dir, make_pdf=make_pdf, session=s, dry_run=dry_run)
-            results.append(res)
+            return download_chapter_by_number(series_id, chap.chapter_num, out_dir, make_pdf=make_pdf, session=s, dry_run=dry_run, chapters=chapters)
         except Exception as e:
             print(f"Error downloading chapter {chap.chapter_num}: {e}")
+            return None
+
+    done = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        futures = {ex.submit(_job, i / 2.0): i for i in range(start_half, end_half + 1)}
+        for fut in as_completed(futures):
+            res = fut.result()
+            if res is not None:
+                done[futures[fut]] = res
 
+    results = [done[i] for i in sorted(done)]
     if not results:
         raise RuntimeError(f"No chapters were downloaded starting from {from_chapter}")
 
@@ -447,6 +675,7 @@ if __name__ == "__main__":
     p.add_argument("--out", "-o", default="downloads", help="Output directory")
     p.add_argument("--no-pdf", dest="pdf", action="store_false", help="Do not generate PDF; save images instead")
     p.add_argument("--dry-run", action="store_true", help="Print actions without downloading")
+    p.add_argument("--workers", type=int, default=4, help=f"Number of chapters to download concurrently with --from; image requests across all workers are capped at {MAX_IMAGE_FETCHES} in flight")
     args = p.parse_args()
 
     # Ensure output directory exists and initialize DB for tracking
@@ -458,10 +687,12 @@ if __name__ == "__main__":
         print(f"Warning: failed to initialize DB at {db_path}: {e}")
 
     if args.latest:
-        chap = get_latest_chapter(args.series)
+        # fetch the listing once and reuse it to resolve the chapter for download
+        chapters = get_chapters_from_series(args.series)
+        chap = get_latest_chapter(args.series, chapters=chapters)
         print(f"Latest chapter: {chap.display_name} -> {chap.get_url(args.series)}")
-        download_chapter_by_number(args.series, chap.chapter_num, args.out, make_pdf=args.pdf, dry_run=args.dry_run)
+        download_chapter_by_number(args.series, chap.chapter_num, args.out, make_pdf=args.pdf, dry_run=args.dry_run, chapters=chapters)
 
     elif args.from_chapter is not None:
         print(f"Downloading from chapter {args.from_chapter} to latest for series {args.series}")
-        download_from_chapter_to_latest(args.series, args.from_chapter, args.out, make_pdf=args.pdf, dry_run=args.dry_run)
+        download_from_chapter_to_latest(args.series, args.from_chapter, args.out, make_pdf=args.pdf, dry_run=args.dry_run, workers=args.workers)
@@ -1,17 +1,96 @@
 """Chapter discovery and URL generation for bato.to."""
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36"
 }
 
+# Shared session (also used by bato_scraper): keeps TCP+TLS connections to the
+# site alive across calls and retries transient failures (rate limiting,
+# gateway errors) with backoff.
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional fast JSON parser
+    _json_loads = json.loads
+
+_RAW_DECODER = json.JSONDecoder()
+
+
+def decode_body(r: requests.Response) -> str:
+    """Decode a response body once (every r.text access re-decodes it).
+
+    Uses the declared charset, then the detected one, then utf-8; unknown
+    charsets fall back to utf-8 and undecodable bytes are replaced.
+    """
+    encoding = r.encoding or r.apparent_encoding or "utf-8"
+    try:
+        return r.content.decode(encoding, errors="replace")
+    except LookupError:
+        return r.content.decode("utf-8", errors="replace")
+
+
+@lru_cache(maxsize=32)
+def _href_pattern(series_id: str) -> re.Pattern:
+    """Compiled pattern matching chapter links of one series."""
+    return re.compile(rf'/title/{series_id}/(\d+)-(?:vol_(\d+)_)?ch_([0-9.]+)')
+
+
+def _extract_window_data(text: str) -> Optional[dict]:
+    """Parse the object assigned to window.__DATA__ in a page, if present and valid JSON.
+
+    The usual layout ends the assignment right before </script>, so the object is
+    sliced at that point and parsed with orjson. If that slice is not valid JSON
+    (e.g. more statements follow), json's raw_decode finds where the object ends.
+    """
+    idx = text.find("window.__DATA__")
+    if idx < 0:
+        return None
+    start = text.find("{", idx)
+    if start < 0:
+        return None
+    data = None
+    # last "}" before the closing </script> tag
+    script_end = text.find("</script>", start)
+    if script_end < 0:
+        script_end = len(text)
+    end = text.rfind("}", start, script_end)
+    if end > start:
+        try:
+            data = _json_loads(text[start:end + 1])
+        except ValueError:
+            data = None
+    if data is None:
+        try:
+            data, _ = _RAW_DECODER.raw_decode(text, start)
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
 @dataclass
 class Chapter:
     """Represents a manga chapter with its ID, number and metadata."""
@@ -39,7 +118,21 @@ class Chapter:
         return " ".join(parts)
 
 
-def get_chapters_from_series(series_id: str, session: Optional[requests.Session] = None) -> List[Chapter]:
+class ChapterIndex(list):
+    """List of chapters sorted by number, with a `by_num` dict for O(1) lookup.
+
+    by_num is keyed on round(chapter_num, 2) and keeps the first chapter listed
+    for each number.
+    """
+
+    def __init__(self, chapters: Iterable[Chapter] = ()):
+        super().__init__(sorted(chapters, key=lambda x: x.chapter_num))
+        self.by_num: Dict[float, Chapter] = {}
+        for c in self:
+            self.by_num.setdefault(round(c.chapter_num, 2), c)
+
+
+def get_chapters_from_series(series_id: str, session: Optional[requests.Session] = None) -> ChapterIndex:
     """Fetch the series page and extract chapter information.
     
     Args:
@@ -47,51 +140,38 @@ def get_chapters_from_series(series_id: str, session: Optional[requests.Session]
         session: Optional requests session to use
     
     Returns:
-        List of Chapter objects with IDs and numbers.
+        ChapterIndex of Chapter objects with IDs and numbers, sorted by number.
     """
-    s = session or requests.Session()
+    s = session or SESSION
     url = f"https://bato.si/title/{series_id}"
     r = s.get(url, headers=DEFAULT_HEADERS, timeout=20)
     r.raise_for_status()
+    text = decode_body(r)
 
     # Find the chapter list data in the page
     # Usually embedded as JSON in a script tag or data attribute
     chapters = []
     
-    # Look for chapter data in scripts
-    script_pattern = re.compile(r'window\.__DATA__\s*=\s*({[^}]+})')
-    json_pattern = re.compile(r'"chapters":\s*(\[[^\]]+\])')
-    
-    # First try script tags
-    for match in script_pattern.finditer(r.text):
+    # First try the window.__DATA__ script blob
+    data = _extract_window_data(text)
+    chaps = data.get("chapters") if data else None
+    for c in chaps if isinstance(chaps, list) else ():
+        if not (isinstance(c, dict) and 'id' in c):
+            continue
         try:
-            data = match.group(1)
-            if '"chapters"' in data:
-                for m in json_pattern.finditer(data):
-                    try:
-                        chaps = json.loads(m.group(1))
-                        for c in chaps:
-                            if isinstance(c, dict) and 'id' in c:
-                                ch_num = float(c.get('number', 0))
-                                vol = str(c.get('volume', '')).strip() or None
-                                title = c.get('title', '').strip() or None
-                                lang = c.get('lang', 'en')
-                                chapters.append(Chapter(
-                                    chapter_id=str(c['id']),
-                                    chapter_num=ch_num,
-                                    volume=vol,
-                                    title=title,
-                                    lang=lang
-                                ))
-                    except (ValueError, json.JSONDecodeError):
-                        continue
-        except Exception:
+            chapters.append(Chapter(
+                chapter_id=str(c['id']),
+                chapter_num=float(c.get('number', 0)),
+                volume=str(c.get('volume') or '').strip() or None,
+                title=(c.get('title') or '').strip() or None,
+                lang=c.get('lang', 'en')
+            ))
+        except (TypeError, ValueError):
             continue
 
     # If no chapters found, try extracting from hrefs
     if not chapters:
-        href_pattern = re.compile(rf'/title/{series_id}/(\d+)-(?:vol_(\d+)_)?ch_([0-9.]+)')
-        for match in href_pattern.finditer(r.text):
+        for match in _href_pattern(series_id).finditer(text):
             ch_id, vol, ch_num = match.groups()
             try:
                 chapters.append(Chapter(
@@ -103,62 +183,123 @@ def get_chapters_from_series(series_id: str, session: Optional[requests.Session]
                 continue
 
     # Sort by chapter number
-    chapters.sort(key=lambda x: x.chapter_num)
-    return chapters
+    return ChapterIndex(chapters)
+
+
+# Bato.to often uses IDs in these ranges for older chapters; only probed when the
+# listing gives no numeric IDs to anchor on.
+_LEGACY_PROBE_IDS = list(range(1680600, 1680700)) + list(range(3255000, 3255200))
+# how far either side of a neighbouring chapter's ID to probe
+PROBE_WINDOW = 50
+
+
+def _candidate_ids(chapters: List[Chapter], chapter_num: float) -> List[int]:
+    """Return chapter IDs worth probing for a chapter missing from the listing.
+
+    IDs cluster around the chapters uploaded just before and after the missing one,
+    so probe a window around the nearest listed neighbours, closest IDs first.
+    """
+    numbered = [(c.chapter_num, int(c.chapter_id)) for c in chapters if c.chapter_id.isdigit()]
+    if not numbered:
+        return list(_LEGACY_PROBE_IDS)
+
+    anchors = []
+    below = [x for x in numbered if x[0] < chapter_num]
+    above = [x for x in numbered if x[0] > chapter_num]
+    if below:
+        anchors.append(max(below)[1])
+    if above:
+        anchors.append(min(above)[1])
+
+    known = {i for _, i in numbered}
+    ids = {i for a in anchors for i in range(a - PROBE_WINDOW, a + PROBE_WINDOW + 1)} - known
+    return sorted(ids, key=lambda i: (min(abs(i - a) for a in anchors), i))
+
+
+async def _probe_ids_async(series_id: str, candidates: List[Chapter], concurrency: int = 16) -> Optional[Chapter]:
+    """HEAD each candidate's URL concurrently and return the first that answers 200.
+
+    Remaining requests are cancelled as soon as a match is found.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=5)
+
+    async def _check(client: aiohttp.ClientSession, chapter: Chapter) -> Optional[Chapter]:
+        async with sem:
+            try:
+                async with client.head(chapter.get_url(series_id), allow_redirects=True, timeout=timeout) as r:
+                    return chapter if r.status == 200 else None
+            except Exception:
+                return None
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, trust_env=True) as client:
+        tasks = [asyncio.ensure_future(_check(client, c)) for c in candidates]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                found = await fut
+                if found is not None:
+                    return found
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return None
 
 
-def find_chapter_by_number(series_id: str, chapter_num: float, session: Optional[requests.Session] = None) -> Optional[Chapter]:
+def find_chapter_by_number(series_id: str, chapter_num: float, session: Optional[requests.Session] = None, probe_ids: bool = False, chapters: Optional[List[Chapter]] = None) -> Optional[Chapter]:
     """Find a specific chapter's info given its number.
     
     Args:
         series_id: The series ID (e.g., "86663-en-grand-blue-dreaming-official")
         chapter_num: The chapter number (e.g., 45.5)
         session: Optional requests session
+        probe_ids: If the chapter is missing from the listing, guess its ID by
+            probing URLs near the neighbouring chapters' IDs (slow, rarely succeeds)
+        chapters: Already-fetched listing (ideally the ChapterIndex returned by
+            get_chapters_from_series); fetched here when omitted
     
     Returns:
         Chapter object if found, None otherwise
     """
-    chapters = get_chapters_from_series(series_id, session)
+    if chapters is None:
+        chapters = get_chapters_from_series(series_id, session)
     
     # First try to find exact match in current listing
+    by_num = getattr(chapters, "by_num", None)
+    if by_num is not None:
+        chapter = by_num.get(round(chapter_num, 2))
+        if chapter is not None:
+            return chapter
     for chapter in chapters:
         if abs(chapter.chapter_num - chapter_num) < 0.01:  # handle float comparison
             return chapter
             
     # If chapter number is greater than any available chapter, fail fast
-    if chapters and chapter_num > max(c.chapter_num for c in chapters):
-        return None
+    # (a ChapterIndex is sorted, so its last entry is the latest)
+    if chapters:
+        latest = chapters[-1].chapter_num if isinstance(chapters, ChapterIndex) else max(c.chapter_num for c in chapters)
+        if chapter_num > latest:
+            return None
         
-    # Not found in current listing - try constructing the URL with probable IDs
-    s = session or requests.Session()
-    
-    # Try a range of potential chapter IDs
-    # Bato.to often uses IDs in this range for older chapters
-    potential_ids = list(range(1680600, 1680700)) + list(range(3255000, 3255200))
-    
-    for ch_id in potential_ids:
-        try:
-            # Determine likely volume (rough estimate)
-            vol = str(max(1, int(chapter_num // 4)))
-            chapter = Chapter(
-                chapter_id=str(ch_id),
-                chapter_num=chapter_num,
-                volume=vol
-            )
-            # Verify the chapter exists by making a HEAD request
-            url = chapter.get_url(series_id)
-            r = s.head(url, headers=DEFAULT_HEADERS, allow_redirects=True, timeout=5)
-            if r.status_code == 200:
-                return chapter
-        except Exception:
-            continue
+    # Not found in current listing - optionally try constructing the URL with probable IDs
+    if probe_ids:
+        # Determine likely volume (rough estimate)
+        vol = str(max(1, int(chapter_num // 4)))
+        candidates = [
+            Chapter(chapter_id=str(ch_id), chapter_num=chapter_num, volume=vol)
+            for ch_id in _candidate_ids(chapters, chapter_num)
+        ]
+        found = asyncio.run(_probe_ids_async(series_id, candidates))
+        if found is not None:
+            return found
 
     # Not found - prepare helpful error message
     available = sorted(set(c.chapter_num for c in chapters))
-    closest = min(available, key=lambda x: abs(x - chapter_num))
 
     msg = [f"Chapter {chapter_num} not found."]
     if len(available) > 0:
+        closest = min(available, key=lambda x: abs(x - chapter_num))
         msg.append(f"Closest chapter: {closest}")
         # Show range of available chapters
         msg.append(f"Available range: {min(available)} - {max(available)}")
@@ -170,13 +311,14 @@ def find_chapter_by_number(series_id: str, chapter_num: float, session: Optional
     raise RuntimeError('\n'.join(msg))
 
 
-def get_chapter_url(series_id: str, chapter_num: float, session: Optional[requests.Session] = None) -> str:
+def get_chapter_url(series_id: str, chapter_num: float, session: Optional[requests.Session] = None, probe_ids: bool = False) -> str:
     """Get the full URL for a chapter given its number.
     
     Args:
         series_id: The series ID (e.g., "86663-en-grand-blue-dreaming-official")
         chapter_num: The chapter number (e.g., 45.5)
         session: Optional requests session
+        probe_ids: Passed through to find_chapter_by_number
     
     Returns:
         Full chapter URL
@@ -184,7 +326,7 @@ def get_chapter_url(series_id: str, chapter_num: float, session: Optional[reques
     Raises:
         RuntimeError if chapter not found
     """
-    chapter = find_chapter_by_number(series_id, chapter_num, session)
+    chapter = find_chapter_by_number(series_id, chapter_num, session, probe_ids=probe_ids)
     if not chapter:
         raise RuntimeError(f"Chapter {chapter_num} not found in series {series_id}")
     return chapter.get_url(series_id)
\ No newline at end of file
@@ -6,11 +6,27 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 _DB_PATH: Optional[str] = None
+# one long-lived connection shared by all threads; _LOCK serializes its use
+_CONN: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
+
+_UPSERT_SQL = """
+    INSERT INTO downloads (series, chapter_num, chapter_id, url, out_path, status, size, downloaded_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(series, chapter_num) DO UPDATE SET
+      chapter_id=excluded.chapter_id,
+      url=excluded.url,
+      out_path=excluded.out_path,
+      status=excluded.status,
+      size=excluded.size,
+      downloaded_at=excluded.downloaded_at
+"""
 
 
 def init_db(db_path: str) -> None:
@@ -18,11 +34,19 @@ def init_db(db_path: str) -> None:
 
     db_path: full path to sqlite file. Directory will be created if missing.
     """
-    global _DB_PATH
+    global _DB_PATH, _CONN
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    _DB_PATH = db_path
+    with _LOCK:
+        if _CONN is not None and _DB_PATH != db_path:
+            _CONN.close()
+            _CONN = None
+        _DB_PATH = db_path
     with _get_conn() as conn:
         cur = conn.cursor()
+        # WAL lets readers proceed during writes; NORMAL skips the fsync per commit
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS downloads (
@@ -39,18 +63,27 @@ def init_db(db_path: str) -> None:
             )
             """
         )
+        # redundant: SQLite already builds an automatic index for
+        # UNIQUE(series, chapter_num); kept only as an explicit, named index
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_series_num ON downloads(series, chapter_num)")
         conn.commit()
 
 
 @contextmanager
 def _get_conn():
+    """Yield the shared connection, opening it on first use, while holding _LOCK."""
+    global _CONN
     if not _DB_PATH:
         raise RuntimeError("DB not initialized. Call init_db(path) first.")
-    conn = sqlite3.connect(_DB_PATH, timeout=10)
-    try:
-        yield conn
-    finally:
-        conn.close()
+    with _LOCK:
+        if _CONN is None:
+            _CONN = sqlite3.connect(_DB_PATH, timeout=10, check_same_thread=False)
+        try:
+            yield _CONN
+        except Exception:
+            # don't leave a half-done transaction open on the shared connection
+            _CONN.rollback()
+            raise
 
 
 def record_download(series: str, chapter_num: float, chapter_id: Optional[str], url: Optional[str], out_path: str, status: str = "completed", size: Optional[int] = None) -> None:
@@ -61,39 +94,45 @@ def record_download(series: str, chapter_num: float, chapter_id: Optional[str],
     """
     now = datetime.utcnow().isoformat() + "Z"
     with _get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO downloads (series, chapter_num, chapter_id, url, out_path, status, size, downloaded_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(series, chapter_num) DO UPDATE SET
-              chapter_id=excluded.chapter_id,
-              url=excluded.url,
-              out_path=excluded.out_path,
-              status=excluded.status,
-              size=excluded.size,
-              downloaded_at=excluded.downloaded_at
-            """,
-            (series, chapter_num, chapter_id, url, out_path, status, size, now),
-        )
+        conn.execute(_UPSERT_SQL, (series, chapter_num, chapter_id, url, out_path, status, size, now))
         conn.commit()
 
 
-def was_downloaded(series: str, chapter_num: float) -> bool:
-    """Return True if the chapter is recorded as completed and has non-zero size."""
+def record_downloads_bulk(rows: Iterable[Tuple[str, float, Optional[str], Optional[str], str, str, Optional[int]]]) -> None:
+    """Insert or update many download records in a single transaction.
+
+    rows: tuples of (series, chapter_num, chapter_id, url, out_path, status, size),
+    i.e. the positional arguments of record_download.
+    """
+    now = datetime.utcnow().isoformat() + "Z"
+    params = [tuple(row) + (now,) for row in rows]
+    if not params:
+        return
+    with _get_conn() as conn:
+        conn.executemany(_UPSERT_SQL, params)
+        conn.commit()
+
+
+def get_downloaded_path(series: str, chapter_num: float) -> Optional[str]:
+    """Return the recorded out_path if the chapter is recorded as completed with non-zero size."""
     with _get_conn() as conn:
         cur = conn.cursor()
         cur.execute(
-            "SELECT status, size FROM downloads WHERE series = ? AND chapter_num = ? LIMIT 1",
+            "SELECT status, size, out_path FROM downloads WHERE series = ? AND chapter_num = ? LIMIT 1",
             (series, chapter_num),
         )
         row = cur.fetchone()
         if not row:
-            return False
-        status, size = row
+            return None
+        status, size, out_path = row
         if status == "completed" and size and size > 0:
-            return True
-        return False
+            return out_path
+        return None
+
+
+def was_downloaded(series: str, chapter_num: float) -> bool:
+    """Return True if the chapter is recorded as completed and has non-zero size."""
+    return get_downloaded_path(series, chapter_num) is not None
 
 
 def get_all_downloads(series: Optional[str] = None):
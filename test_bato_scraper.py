@@ -1,3 +1,12 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import bato_scraper
 from bato_scraper import parse_image_urls_from_html
 
 
@@ -18,3 +27,201 @@ def test_parse_basic_images():
     assert any('003.jpg' in u for u in out)
     # logo should be filtered out
     assert all('logo.png' not in u for u in out)
+
+
+def test_parse_matches_bs4_fallback(monkeypatch):
+    html = '''
+    <picture><source srcset="https://cdn.example.com/manga/010.webp 1x, https://cdn.example.com/manga/010@2x.webp 2x"></picture>
+    <img data-lazy-src="/media/011.png" src="/media/placeholder.gif" />
+    <img data-image="https://cdn.example.com/manga/012.jpg" />
+    <template id="next-page"><img src="/media/013.jpg" /></template>
+    <img src="/media/014.jpg" />
+    '''
+    base = "https://bato.si/title/x/1-ch_1"
+    fast = parse_image_urls_from_html(html, base_url=base)
+    monkeypatch.setattr(bato_scraper, "LexborHTMLParser", None)
+    slow = parse_image_urls_from_html(html, base_url=base)
+    assert fast == slow
+    assert "https://bato.si/media/011.png" in fast
+    assert "https://cdn.example.com/manga/010.webp" in fast
+    # <template> content is not part of the rendered page on either path
+    assert "https://bato.si/media/013.jpg" not in fast
+    assert "https://bato.si/media/014.jpg" in fast
+
+
+def test_select_one_per_page_collapses_mirrors():
+    urls = [
+        "https://k1.example.com/media/87981023_1920_2735_569558.webp",
+        "https://example.com/static-assets/banner.png",
+        "https://k2.example.com/media/87981023_1920_2735_569558.webp",
+        "https://k1.example.com/media/cover.jpg",
+        "https://k1.example.com/media/87981024_1920_2735_411020.webp",
+    ]
+    out = bato_scraper.select_one_per_page(urls)
+    assert out == [
+        "https://k1.example.com/media/87981023_1920_2735_569558.webp",
+        "https://k1.example.com/media/87981024_1920_2735_411020.webp",
+        "https://k1.example.com/media/cover.jpg",
+    ]
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Serves /img/* as 200, /missing.jpg as 404 and /rate.jpg as 429 once, then 200."""
+
+    def do_GET(self):
+        self.server.seen.append((self.headers.get("Host", "").split(":")[0], self.path, self.headers.get("Cookie")))
+        if self.path == "/rate.jpg" and self.path not in self.server.limited:
+            self.server.limited.add(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/img/") or self.path == "/rate.jpg":
+            if "slow" in self.path:
+                with self.server.lock:
+                    self.server.active += 1
+                    self.server.peak = max(self.server.peak, self.server.active)
+                time.sleep(0.05)
+                with self.server.lock:
+                    self.server.active -= 1
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server(monkeypatch):
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+    server.seen = []
+    server.limited = set()
+    server.lock = threading.Lock()
+    server.active = server.peak = 0
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_images_order_retry_and_failures(image_server, tmp_path):
+    base = f"http://127.0.0.1:{image_server.server_port}"
+    urls = [f"{base}/img/1.jpg", f"{base}/missing.jpg", f"{base}/rate.jpg", f"{base}/img/2.jpg", f"{base}/img/1.jpg"]
+    saved = bato_scraper.download_images(urls, str(tmp_path), prefix="page")
+    assert [os.path.basename(p) for p in saved] == ["page_1.jpg", "page_rate.jpg", "page_2.jpg", "page_1_1.jpg"]
+    with open(saved[1], "rb") as fh:
+        assert fh.read() == b"/rate.jpg"
+    assert [p for _, p, _ in image_server.seen].count("/rate.jpg") == 2
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".part")]
+
+
+def test_download_images_scopes_cookies_to_domain(image_server, tmp_path):
+    port = image_server.server_port
+    session = requests.Session()
+    session.cookies.set("sid", "abc", domain="localhost", path="/")
+    urls = [f"http://localhost:{port}/img/a.jpg", f"http://127.0.0.1:{port}/img/b.jpg"]
+    assert len(bato_scraper.download_images(urls, str(tmp_path), session=session)) == 2
+    cookies = {host: cookie for host, _, cookie in image_server.seen}
+    assert cookies["localhost"] == "sid=abc"
+    assert cookies["127.0.0.1"] is None
+
+
+def test_image_fetch_slots_shared_across_threads(image_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(bato_scraper, "_FETCH_SLOTS", threading.BoundedSemaphore(2))
+    base = f"http://127.0.0.1:{image_server.server_port}"
+
+    def worker(n):
+        bato_scraper.download_images([f"{base}/img/slow_{n}_{i}.jpg" for i in range(4)], str(tmp_path / str(n)))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(len(os.listdir(tmp_path / str(n))) for n in range(3)) == 12
+    assert image_server.peak <= 2
+
+
+def test_prepare_pdf_inputs_reencodes_only_bad_pages(tmp_path, monkeypatch):
+    from PIL import Image
+
+    paths = []
+    for name, fmt in (("page_1.jpg", "JPEG"), ("page_2.webp", "WEBP"), ("page_3.png", "PNG")):
+        paths.append(str(tmp_path / name))
+        Image.new("RGB", (20, 30), "red").save(paths[-1], fmt)
+    good, webp, bad = paths
+
+    real_convert = bato_scraper.img2pdf.convert
+
+    def convert(inputs, **kwargs):
+        if bad in inputs:
+            raise ValueError("unsupported PNG")
+        return real_convert(inputs, **kwargs)
+
+    monkeypatch.setattr(bato_scraper.img2pdf, "convert", convert)
+    converted = [str(tmp_path / "pdf_0001.jpg"), str(tmp_path / "pdf_0002.jpg")]
+    assert bato_scraper._prepare_pdf_inputs(paths, str(tmp_path)) == [good, converted[0], bad]
+    # only the page img2pdf rejects is re-encoded; the good JPEG passes through
+    assert bato_scraper._prepare_pdf_inputs(paths, str(tmp_path), validate=True) == [good] + converted
+
+
+def test_db_precheck_only_skips_recorded_existing_artifact(tmp_path, monkeypatch):
+    import db
+    from chapter_discovery import Chapter, ChapterIndex
+
+    db.init_db(str(tmp_path / "scraper.db"))
+    out = str(tmp_path)
+    pdf = bato_scraper._artifact_path(out, "s", 45, make_pdf=True)
+    with open(pdf, "wb") as fh:
+        fh.write(b"%PDF" * 512)
+    db.record_download("s", 45.0, "1", "u", pdf, status="completed", size=2048)
+
+    fetched = []
+    monkeypatch.setattr(bato_scraper, "get_image_urls", lambda url, session=None: fetched.append(url) or [])
+    monkeypatch.setattr(bato_scraper, "download_images", lambda *a, **k: [])
+    chapters = ChapterIndex([Chapter("1", 45.0)])
+
+    # recorded PDF exists: skipped without resolving the chapter
+    assert bato_scraper.download_chapter_by_number("s", 45, out, chapters=[]) == pdf
+    assert not fetched
+
+    # images were asked for, but only the PDF was recorded: download the images
+    folder = bato_scraper.download_chapter_by_number("s", 45, out, make_pdf=False, chapters=chapters)
+    assert folder == bato_scraper._artifact_path(out, "s", 45, make_pdf=False)
+    assert len(fetched) == 1
+
+
+def test_atomic_write_cleans_up_on_failure(tmp_path, monkeypatch):
+    target = str(tmp_path / "page_1.jpg")
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(bato_scraper.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        bato_scraper._atomic_write(target, b"data")
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_images_limit_counts_saved_images(image_server, tmp_path):
+    base = f"http://127.0.0.1:{image_server.server_port}"
+    urls = [f"{base}/img/1.jpg", f"{base}/missing.jpg", f"{base}/img/2.jpg", f"{base}/img/3.jpg"]
+    saved = bato_scraper.download_images(urls, str(tmp_path), limit=2)
+    assert [os.path.basename(p) for p in saved] == ["1.jpg", "2.jpg"]
+
+
+def test_download_images_reuses_io_pool(image_server, tmp_path):
+    base = f"http://127.0.0.1:{image_server.server_port}"
+    bato_scraper.download_images([f"{base}/img/1.jpg"], str(tmp_path / "a"))
+    pool = bato_scraper._io_pool()
+    bato_scraper.download_images([f"{base}/img/2.jpg"], str(tmp_path / "b"))
+    assert bato_scraper._io_pool() is pool
+    assert os.path.exists(tmp_path / "b" / "2.jpg")
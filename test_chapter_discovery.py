@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import chapter_discovery
+from chapter_discovery import Chapter, ChapterIndex, _extract_window_data, decode_body, find_chapter_by_number
+
+
+def test_extract_window_data_nested_json():
+    html = '''
+    <script>
+      window.__DATA__ = {"series": {"id": 86663, "name": "A {braced} title"},
+        "chapters": [{"id": 1680643, "number": 45.5, "volume": 11, "meta": {"w": 1}},
+                     {"id": 1680650, "number": 46, "title": "Next"}]};
+    </script>
+    '''
+    data = _extract_window_data(html)
+    assert data["series"]["name"] == "A {braced} title"
+    assert [c["id"] for c in data["chapters"]] == [1680643, 1680650]
+
+
+def test_extract_window_data_missing_or_invalid():
+    assert _extract_window_data("<html></html>") is None
+    assert _extract_window_data("window.__DATA__ = {chapters: undefined};") is None
+
+
+def test_chapter_index_lookup():
+    idx = ChapterIndex([Chapter("3", 46.0), Chapter("1", 45.5), Chapter("2", 45.5, lang="fr")])
+    assert [c.chapter_id for c in idx] == ["1", "2", "3"]
+    assert find_chapter_by_number("s", 45.5, chapters=idx).chapter_id == "1"
+    assert find_chapter_by_number("s", 46, chapters=idx).chapter_id == "3"
+    assert find_chapter_by_number("s", 47, chapters=idx) is None
+
+
+def test_extract_window_data_followed_by_other_statements():
+    html = '<script>window.__DATA__ = {"chapters": [{"id": 1, "number": 1}]}; window.x = {"y": "}"};</script>'
+    assert _extract_window_data(html) == {"chapters": [{"id": 1, "number": 1}]}
+
+
+def test_decode_body_unknown_charset():
+    r = requests.Response()
+    r._content = "<p>café</p>".encode("utf-8")
+    r.encoding = "x-unknown-charset"
+    assert decode_body(r) == "<p>café</p>"
+
+
+def test_candidate_ids_near_neighbours():
+    chapters = [Chapter("100", 4.0), Chapter("101", 4.5), Chapter("110", 6.0), Chapter("120", 7.0)]
+    ids = chapter_discovery._candidate_ids(chapters, 5.0)
+    # windows around the IDs of 4.5 (below) and 6.0 (above), nearest first
+    assert ids[:7] == [102, 109, 111, 99, 103, 108, 112]
+    assert not {100, 101, 110, 120} & set(ids)
+    w = chapter_discovery.PROBE_WINDOW
+    assert min(ids) == 101 - w and max(ids) == 110 + w
+
+
+def test_candidate_ids_legacy_ranges_without_numeric_ids():
+    ids = chapter_discovery._candidate_ids([Chapter("abc", 4.0)], 5.0)
+    assert ids == chapter_discovery._LEGACY_PROBE_IDS
+
+
+class _ProbeHandler(BaseHTTPRequestHandler):
+    """Answers HEAD /title/<series>/<id> with 200 only for the server's `match` id."""
+
+    def do_HEAD(self):
+        self.send_response(200 if self.path.endswith(f"/{self.server.match}") else 404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def probe_server(monkeypatch):
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ProbeHandler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(Chapter, "get_url", lambda self, series_id: f"{base}/title/{series_id}/{self.chapter_id}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_probe_ids_returns_match(probe_server):
+    probe_server.match = "105"
+    candidates = [Chapter(str(i), 5.0) for i in range(100, 140)]
+    found = asyncio.run(chapter_discovery._probe_ids_async("s", candidates))
+    assert found is not None and found.chapter_id == "105"
+
+    probe_server.match = "999"
+    assert asyncio.run(chapter_discovery._probe_ids_async("s", candidates)) is None
@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+
+import db
+
+
+def test_bulk_upsert_round_trip(tmp_path):
+    db.init_db(str(tmp_path / "scraper.db"))
+    db.record_downloads_bulk([
+        ("s", 1.0, "11", "u1", "/p1", "completed", 10),
+        ("s", 2.0, "12", "u2", "/p2", "dry-run", None),
+    ])
+    assert db.was_downloaded("s", 1.0)
+    assert not db.was_downloaded("s", 2.0)
+
+    # second batch updates the existing (series, chapter_num) rows in place
+    db.record_downloads_bulk([("s", 2.0, "12", "u2", "/p2", "completed", 20)])
+    assert db.was_downloaded("s", 2.0)
+    assert [(r[2], r[6], r[7]) for r in db.get_all_downloads("s")] == [(1.0, "completed", 10), (2.0, "completed", 20)]
+
+
+def test_bulk_failure_rolls_back_whole_batch(tmp_path):
+    db.init_db(str(tmp_path / "scraper.db"))
+    with pytest.raises(sqlite3.IntegrityError):
+        db.record_downloads_bulk([
+            ("s", 1.0, "11", "u1", "/p1", "completed", 10),
+            (None, 2.0, "12", "u2", "/p2", "completed", 10),  # series is NOT NULL
+        ])
+    assert db.get_all_downloads() == []
+    # the shared connection is still usable afterwards
+    db.record_download("s", 3.0, "13", "u3", "/p3", size=5)
+    assert db.was_downloaded("s", 3.0)
+
+
+def test_init_db_switches_path(tmp_path):
+    first = str(tmp_path / "a" / "scraper.db")
+    second = str(tmp_path / "b" / "scraper.db")
+    db.init_db(first)
+    db.record_download("s", 1.0, "11", "u", "/p", size=5)
+
+    db.init_db(second)
+    assert not db.was_downloaded("s", 1.0)
+    db.record_download("s", 2.0, "12", "u", "/p", size=5)
+
+    db.init_db(first)
+    assert db.was_downloaded("s", 1.0)
+    assert not db.was_downloaded("s", 2.0)
+    assert sqlite3.connect(first).execute("PRAGMA journal_mode").fetchone() == ("wal",)